@@ -1,8 +1,12 @@
 import random
 import pygame
 import time
+import numpy as np
 from collections import Counter
-from lista import palavras, melhor_palavra
+from lista import melhor_palavra
+from lista_binaria import palavras, ids_por_tamanho
+from padroes import verificar, codigo_para_emoji, digitos_codigo
+from restricoes import EstadoRestricoes
 
 
 # Funções auxiliares
@@ -10,28 +14,7 @@ def escolher_palavra():
     return random.choice(palavras)
 
 
-def verificar_palavra(palavra_secreta, tentativa):
-    resultado = ["⬜"] * len(tentativa)
-    palavra_secreta_lista = list(palavra_secreta)
-    tentativa_lista = list(tentativa)
-
-    # Primeira passada: marca os acertos exatos (🟩)
-    for i in range(len(tentativa)):
-        if tentativa[i] == palavra_secreta[i]:
-            resultado[i] = "🟩"
-            palavra_secreta_lista[i] = None
-            tentativa_lista[i] = None
-
-    # Segunda passada: marca os acertos parciais (🟨)
-    for i in range(len(tentativa)):
-        if tentativa_lista[i] is not None and tentativa_lista[i] in palavra_secreta_lista:
-            resultado[i] = "🟨"
-            palavra_secreta_lista[palavra_secreta_lista.index(tentativa_lista[i])] = None
-
-    return "".join(resultado)
-
-
-def melhor_tentativa(palavras_possiveis):
+def melhor_tentativa(palavras_possiveis, palavras_chute=None):
     if not palavras_possiveis:
         return ""  # Retorna uma string vazia se não houver palavras possíveis
 
@@ -50,53 +33,19 @@ def melhor_tentativa(palavras_possiveis):
         return score
 
     # Escolhe a palavra com maior pontuação baseada na frequência ponderada por posição
-    return max(palavras_possiveis, key=pontuar_palavra)
-
-
-def filtrar_palavras(palavras, tentativa, resultado):
-    palavras_filtradas = []
-
-    for palavra in palavras:
-        palavra_valida = True
-        letras_confirmadas = {}
+    if palavras_chute is None or len(palavras_possiveis) <= 2:
+        return max(palavras_possiveis, key=pontuar_palavra)
 
-        # Primeira passada: validar 🟩 e contar letras confirmadas
-        for i, letra in enumerate(tentativa):
-            if resultado[i] == "🟩":
-                if palavra[i] != letra:
-                    palavra_valida = False
-                    break
-                letras_confirmadas[letra] = letras_confirmadas.get(letra, 0) + 1
+    # Chute vindo de palavras_chute (ex.: a lista completa), pontuado pelas palavras possíveis;
+    # em caso de empate prefere uma palavra que ainda pode ser a secreta
+    possiveis = set(palavras_possiveis)
+    return max(palavras_chute, key=lambda palavra: (pontuar_palavra(palavra), palavra in possiveis))
 
-        if not palavra_valida:
-            continue
 
-        # Segunda passada: validar 🟨 e garantir que estão em outras posições
-        for i, letra in enumerate(tentativa):
-            if resultado[i] == "🟨":
-                if letra not in palavra or palavra[i] == letra:
-                    palavra_valida = False
-                    break
-                letras_confirmadas[letra] = letras_confirmadas.get(letra, 0) + 1
-
-        if not palavra_valida:
-            continue
-
-        # Terceira passada: validar ⬜ (não deve estar presente ou contar corretamente se for letra repetida)
-        for i, letra in enumerate(tentativa):
-            if resultado[i] == "⬜":
-                if letra in palavra:
-                    if palavra.count(letra) > letras_confirmadas.get(letra, 0):
-                        palavra_valida = False
-                        break
-
-        if palavra_valida:
-            palavras_filtradas.append(palavra)
-
-    return palavras_filtradas
-
-
-def jogar_wordle(ia_jogar=False):
+def jogar_wordle(ia_jogar=False, estrategia=None, chute_completo=False, modo_dificil=False):
+    # estrategia: função que recebe os ids possíveis (e os ids de chute) e devolve o id do chute;
+    # None usa melhor_tentativa. Com chute_completo a IA pode chutar qualquer palavra da lista.
+    # modo_dificil: o jogador humano tem que usar todas as letras já reveladas.
     pygame.init()
 
     # Definir cores
@@ -105,6 +54,7 @@ def jogar_wordle(ia_jogar=False):
     VERDE = (0, 255, 0)
     AMARELO = (255, 255, 0)
     CINZA = (128, 128, 128)
+    CORES = (CINZA, AMARELO, VERDE)  # Indexado pelo dígito do feedback (0 ⬜, 1 🟨, 2 🟩)
 
     # Configurações da janela
     largura, altura = 400, 600
@@ -121,13 +71,8 @@ def jogar_wordle(ia_jogar=False):
 
         # Desenhar tentativas anteriores
         for i, tentativa in enumerate(tentativas):
-            for j, letra in enumerate(tentativa[0]):
-                if tentativa[1][j] == "🟩":
-                    cor = VERDE
-                elif tentativa[1][j] == "🟨":
-                    cor = AMARELO
-                else:
-                    cor = CINZA
+            for j, (letra, digito) in enumerate(zip(tentativa[0], digitos_codigo(tentativa[1]))):
+                cor = CORES[digito]
                 pygame.draw.rect(tela, cor, (j * 60 + 50, i * 80 + 50, 50, 50))
                 texto = fonte.render(letra.upper(), True, BRANCO)
                 tela.blit(texto, (j * 60 + 60, i * 80 + 50))
@@ -142,13 +87,14 @@ def jogar_wordle(ia_jogar=False):
 
     # Função para reiniciar o jogo
     def reiniciar_jogo():
-        nonlocal palavra_secreta, tentativas, tentativa_atual, tentativas_restantes, fim_de_jogo, palavras_possiveis
+        nonlocal palavra_secreta, tentativas, tentativa_atual, tentativas_restantes, fim_de_jogo, ids_possiveis, estado
         palavra_secreta = escolher_palavra()
         tentativas = []
         tentativa_atual = ""
         tentativas_restantes = 6
         fim_de_jogo = False
-        palavras_possiveis = [p for p in palavras if len(p) == len(palavra_secreta)]
+        ids_possiveis = ids_por_tamanho[len(palavra_secreta)]
+        estado = EstadoRestricoes()
         if ia_jogar:
             print(f"A IA está jogando. Palavra secreta: {palavra_secreta}")
 
@@ -158,7 +104,9 @@ def jogar_wordle(ia_jogar=False):
     tentativa_atual = ""
     tentativas_restantes = 6
     fim_de_jogo = False
-    palavras_possiveis = [p for p in palavras if len(p) == len(palavra_secreta)]
+    ids_possiveis = ids_por_tamanho[len(palavra_secreta)]
+    estado = EstadoRestricoes()
+    ids_chute = np.arange(len(palavras)) if chute_completo else None
 
     if ia_jogar:
         print(f"A IA está jogando. Palavra secreta: {palavra_secreta}")
@@ -175,10 +123,15 @@ def jogar_wordle(ia_jogar=False):
                 if evento.key == pygame.K_BACKSPACE:
                     tentativa_atual = tentativa_atual[:-1]
                 elif evento.key == pygame.K_RETURN and len(tentativa_atual) == len(palavra_secreta):
-                    resultado = verificar_palavra(palavra_secreta, tentativa_atual)
+                    violacao = estado.violacao_modo_dificil(tentativa_atual) if modo_dificil else None
+                    if violacao:
+                        print(violacao)
+                        continue
+                    resultado = verificar(palavra_secreta, tentativa_atual)
+                    estado.adicionar(tentativa_atual, resultado)
                     tentativas.append((tentativa_atual, resultado))
                     tentativas_restantes -= 1
-                    print(tentativas)
+                    print([(palavra, codigo_para_emoji(codigo)) for palavra, codigo in tentativas])
                     if tentativa_atual == palavra_secreta:
                         fim_de_jogo = True
                         print("Parabéns! Você acertou!")
@@ -193,19 +146,25 @@ def jogar_wordle(ia_jogar=False):
             if tentativas_restantes == 6:
                 time.sleep(0.1)
                 tentativa_atual = melhor_palavra[0]
-                resultado = verificar_palavra(palavra_secreta, tentativa_atual)
+                resultado = verificar(palavra_secreta, tentativa_atual)
                 tentativas.append((tentativa_atual, resultado))
                 tentativas_restantes -= 1
-                palavras_possiveis = filtrar_palavras(palavras_possiveis, tentativa_atual, resultado)
+                estado.adicionar(tentativa_atual, resultado)
+                ids_possiveis = estado.filtrar(ids_possiveis)
 
             else:
-                if palavras_possiveis:
+                if len(ids_possiveis):
                     time.sleep(0.1)
-                    tentativa_atual = melhor_tentativa(palavras_possiveis)
-                    resultado = verificar_palavra(palavra_secreta, tentativa_atual)
+                    if estrategia is None:
+                        tentativa_atual = melhor_tentativa([palavras[i] for i in ids_possiveis],
+                                                           palavras if chute_completo else None)
+                    else:
+                        tentativa_atual = palavras[estrategia(ids_possiveis, ids_chute)]
+                    resultado = verificar(palavra_secreta, tentativa_atual)
                     tentativas.append((tentativa_atual, resultado))
                     tentativas_restantes -= 1
-                    palavras_possiveis = filtrar_palavras(palavras_possiveis, tentativa_atual, resultado)
+                    estado.adicionar(tentativa_atual, resultado)
+                    ids_possiveis = estado.filtrar(ids_possiveis)
 
                     if tentativa_atual == palavra_secreta:
                         fim_de_jogo = True
@@ -240,4 +199,9 @@ def jogar_wordle(ia_jogar=False):
 
 
 # Escolha entre jogar manualmente ou com IA
-jogar_wordle(ia_jogar=True)  # True: IA joga, False: Humano joga
+# As estratégias ficam em estrategias.py (importe a que for usar):
+# estrategia=melhor_tentativa_entropia troca a heurística de frequência pela de entropia;
+# melhor_tentativa_esperada minimiza os candidatos restantes esperados e melhor_tentativa_minimax o pior caso;
+# chute_completo=True deixa a IA chutar qualquer palavra da lista, não só as possíveis;
+# modo_dificil=True obriga o jogador humano a usar as letras já reveladas
+jogar_wordle(ia_jogar=True, estrategia=None, chute_completo=False, modo_dificil=False)  # True: IA joga, False: Humano joga
@@ -1,84 +1,20 @@
+import os
 import random
 import time
 from collections import Counter
 from concurrent.futures import ProcessPoolExecutor
-from lista import palavras
+import numpy as np
+from lista_binaria import palavras, palavras_por_tamanho, ids_por_tamanho
+from estrategias import melhor_tentativa_posicional
+from padroes import feedback, filtrar_ids, separar_por_feedback, id_palavra, TODOS_VERDES, caminho_gerado, \
+    carregar_ou_construir, carregar_matriz, uso_memoria, descrever_memoria
+from indice import sobreviventes
+from paralelo import inicializar_processo, executar_em_blocos
 
 
 # Funções auxiliares
 def escolher_palavra(tamanho=None):
-    filtro = [p.lower() for p in palavras if len(p) == (tamanho if tamanho else len(palavras[0]))]
-    return random.choice(filtro)
-
-
-def verificar_palavra(palavra_secreta, tentativa):
-    palavra_secreta = palavra_secreta.lower()
-    tentativa = tentativa.lower()
-
-    if len(palavra_secreta) != len(tentativa):
-        raise ValueError("A tentativa e a palavra secreta devem ter o mesmo comprimento.")
-
-    resultado = ["⬜"] * len(tentativa)
-    contador_palavra = Counter(palavra_secreta)
-    palavra_secreta_lista = list(palavra_secreta)
-
-    for i, (p, t) in enumerate(zip(palavra_secreta, tentativa)):
-        if t == p:
-            resultado[i] = "🟩"
-            contador_palavra[t] -= 1
-            palavra_secreta_lista[i] = None
-
-    for i, t in enumerate(tentativa):
-        if resultado[i] != "🟩" and t in palavra_secreta_lista:
-            if contador_palavra[t] > 0:
-                resultado[i] = "🟨"
-                contador_palavra[t] -= 1
-                palavra_secreta_lista[palavra_secreta_lista.index(t)] = None
-
-    return "".join(resultado)
-
-
-def filtrar_palavras(lista_palavras, tentativa, resultado):
-    tentativa = tentativa.lower()
-    palavras_filtradas = []
-
-    for palavra in lista_palavras:
-        palavra = palavra.lower()
-        palavra_valida = True
-        letras_confirmadas = Counter()
-        letras_invalidas = set()
-
-        for i in range(len(tentativa)):
-            if resultado[i] == "🟩":
-                if palavra[i] != tentativa[i]:
-                    palavra_valida = False
-                    break
-                letras_confirmadas[tentativa[i]] += 1
-
-        if not palavra_valida:
-            continue
-
-        for i in range(len(tentativa)):
-            if resultado[i] == "🟨":
-                if tentativa[i] not in palavra or palavra[i] == tentativa[i]:
-                    palavra_valida = False
-                    break
-                letras_confirmadas[tentativa[i]] += 1
-
-        if not palavra_valida:
-            continue
-
-        for i in range(len(tentativa)):
-            if resultado[i] == "⬜":
-                if tentativa[i] in palavra and palavra.count(tentativa[i]) > letras_confirmadas[tentativa[i]]:
-                    palavra_valida = False
-                    break
-                letras_invalidas.add(tentativa[i])
-
-        if palavra_valida:
-            palavras_filtradas.append(palavra)
-
-    return palavras_filtradas
+    return random.choice(palavras_por_tamanho[tamanho or len(palavras[0])])
 
 
 def melhor_tentativa(palavras_possiveis):
@@ -98,23 +34,28 @@ def melhor_tentativa(palavras_possiveis):
     return max(palavras_possiveis, key=pontuar_palavra)
 
 
-def jogar_wordle(ia_jogar=False, palavra_inicial=None):
-    palavra_secreta = escolher_palavra()
+def jogar_wordle(ia_jogar=False, palavra_inicial=None, palavra_secreta=None):
+    palavra_secreta = palavra_secreta or escolher_palavra()
     tentativas = []
     tentativas_restantes = 6
-    palavras_possiveis = [p for p in palavras if len(p) == len(palavra_secreta)]
+    ids_possiveis = ids_por_tamanho[len(palavra_secreta)]
 
     while tentativas_restantes > 0:
         if ia_jogar:
             if tentativas_restantes == 6:
                 tentativa_atual = palavra_inicial or escolher_palavra(tamanho=len(palavra_secreta))
             else:
-                tentativa_atual = melhor_tentativa(palavras_possiveis)
+                tentativa_atual = melhor_tentativa([palavras[i] for i in ids_possiveis])
 
-            resultado = verificar_palavra(palavra_secreta, tentativa_atual)
+            id_tentativa = id_palavra[tentativa_atual]
+            resultado = feedback(id_tentativa, id_palavra[palavra_secreta])
             tentativas.append((tentativa_atual, resultado))
             tentativas_restantes -= 1
-            palavras_possiveis = filtrar_palavras(palavras_possiveis, tentativa_atual, resultado)
+            if tentativas_restantes == 5:
+                # Primeira jogada: os candidatos são a lista inteira, então o índice já tem a resposta
+                ids_possiveis = sobreviventes(id_tentativa, resultado)
+            else:
+                ids_possiveis = filtrar_ids(ids_possiveis, id_tentativa, resultado)
 
             if tentativa_atual == palavra_secreta:
                 return 6 - tentativas_restantes
@@ -129,46 +70,223 @@ def simular_jogos_com_palavra_inicial(n, palavra_inicial):
     return sum(resultados) / len(resultados)
 
 
-def simular_jogos_em_sublista(subpalavras, n_simulacoes):
+def simular_jogos_em_sublista(ids_iniciais, n_simulacoes):
     melhores_palavras = []
-    for idx, palavra in enumerate(subpalavras):
+    for id_inicial in ids_iniciais:
+        palavra = palavras[id_inicial]
         media_tentativas = simular_jogos_com_palavra_inicial(n_simulacoes, palavra)
         melhores_palavras.append((palavra, media_tentativas))
-    return melhores_palavras
+    return melhores_palavras, uso_memoria()
 
 
-def encontrar_melhor_palavra_inicial(n_simulacoes_por_palavra, n_processos):
+def encontrar_melhor_palavra_inicial(n_simulacoes_por_palavra, n_processos=None, tamanho_bloco=8):
     start = time.time()
-
-    sublistas_palavras = [palavras[i::n_processos] for i in range(n_processos)]
-
-    with ProcessPoolExecutor(max_workers=n_processos) as executor:
-        resultados_futuros = [executor.submit(simular_jogos_em_sublista, sublista, n_simulacoes_por_palavra)
-                              for sublista in sublistas_palavras]
-
-        melhores_palavras_sublistas = []
-        for i, futuro in enumerate(resultados_futuros):
-            sublista_resultado = futuro.result()
+    # Garante que a matriz existe antes de criar os processos; cada um abre o arquivo com memmap
+    carregar_matriz()
+    n_processos = n_processos or os.cpu_count()
+
+    melhores_palavras_sublistas = []
+    with ProcessPoolExecutor(max_workers=n_processos, initializer=inicializar_processo) as executor:
+        for sublista_resultado, memoria in executar_em_blocos(executor, simular_jogos_em_sublista, np.arange(len(palavras)),
+                                                              tamanho_bloco, n_simulacoes_por_palavra):
             melhores_palavras_sublistas.extend(sublista_resultado)
-            # Exibindo o progresso dos processos
-            print(f"Processo {i + 1}/{n_processos} finalizado.")
+            # Exibindo o progresso e a memória usada pelo processo que terminou o bloco
+            print(f"{len(melhores_palavras_sublistas)}/{len(palavras)} palavras avaliadas. {descrever_memoria(memoria)}")
 
     melhores_palavras_sublistas.sort(key=lambda x: x[1])
     finish = time.time()
     elapsed = finish - start
     print(f"Tempo total: {elapsed:.5f}s")
-    print(f'Média por simulação: {elapsed / (n_processos * len(palavras)):.5f}s')
+    print(f'Média por simulação: {elapsed / (n_simulacoes_por_palavra * len(palavras)):.5f}s')
     print(f'Média por palavra: {elapsed / len(palavras):.5f}s')
     return melhores_palavras_sublistas
 
 
+def somas_em_sublista(ids_iniciais, n_simulacoes):
+    # Soma e soma dos quadrados das tentativas de n_simulacoes jogos para cada palavra
+    somas = []
+    for id_inicial in ids_iniciais:
+        resultados = [jogar_wordle(ia_jogar=True, palavra_inicial=palavras[id_inicial]) for _ in range(n_simulacoes)]
+        somas.append((id_inicial, sum(resultados), sum(r * r for r in resultados)))
+    return somas
+
+
+def corrida_eliminatoria(n_inicial, top_k, n_processos=None, tamanho_bloco=8):
+    # Successive halving: todas as palavras jogam n_inicial jogos, a pior metade é eliminada
+    # e as sobreviventes completam o dobro de jogos, até restarem top_k palavras.
+    # Retorna (palavra, média, meia-largura do intervalo de 95%) em ordem de média.
+    start = time.time()
+    carregar_matriz()
+
+    n_processos = n_processos or os.cpu_count()
+    candidatas = list(range(len(palavras)))
+    estatisticas = {id_inicial: [0, 0, 0] for id_inicial in candidatas}  # jogos, soma, soma dos quadrados
+    orcamento = n_inicial
+    total_jogos = 0
+    rodada = 1
+
+    with ProcessPoolExecutor(max_workers=n_processos, initializer=inicializar_processo) as executor:
+        while True:
+            # Cada sobrevivente joga só o que falta para chegar ao orçamento da rodada
+            faltam = orcamento - estatisticas[candidatas[0]][0]
+            for somas in executar_em_blocos(executor, somas_em_sublista, candidatas, tamanho_bloco, faltam):
+                for id_inicial, soma, soma_quadrados in somas:
+                    estatisticas[id_inicial][0] += faltam
+                    estatisticas[id_inicial][1] += soma
+                    estatisticas[id_inicial][2] += soma_quadrados
+            total_jogos += faltam * len(candidatas)
+
+            candidatas.sort(key=lambda id_inicial: estatisticas[id_inicial][1] / estatisticas[id_inicial][0])
+            print(f"Rodada {rodada}: {len(candidatas)} palavras com {orcamento} jogos cada "
+                  f"({total_jogos} jogos no total)")
+            if len(candidatas) <= top_k:
+                break
+            candidatas = candidatas[:max(top_k, len(candidatas) // 2)]
+            orcamento *= 2
+            rodada += 1
+
+    ranking = []
+    for id_inicial in candidatas:
+        n, soma, soma_quadrados = estatisticas[id_inicial]
+        media = soma / n
+        variancia = max(soma_quadrados / n - media * media, 0) * n / max(n - 1, 1)
+        ranking.append((palavras[id_inicial], media, 1.96 * (variancia / n) ** 0.5))
+
+    elapsed = time.time() - start
+    print(f"Tempo total: {elapsed:.5f}s")
+    print(f"Jogos simulados: {total_jogos} (contra {len(palavras) * orcamento} com {orcamento} jogos por palavra)")
+    return ranking
+
+
+def segredos_fixos(n_segredos, semente=0):
+    # Sequência de palavras secretas sorteada uma vez (com reposição, como escolher_palavra)
+    # e usada por todas as palavras iniciais: números aleatórios comuns
+    return np.array(random.Random(semente).choices(range(len(palavras)), k=n_segredos))
+
+
+def tentativas_em_sublista(ids_iniciais, ids_segredos):
+    tentativas = np.empty((len(ids_iniciais), len(ids_segredos)), dtype=np.uint8)
+    for i, id_inicial in enumerate(ids_iniciais):
+        for j, id_secreta in enumerate(ids_segredos):
+            tentativas[i, j] = jogar_wordle(ia_jogar=True, palavra_inicial=palavras[id_inicial],
+                                            palavra_secreta=palavras[id_secreta])
+    return ids_iniciais, tentativas
+
+
+def construir_tentativas_pareadas(n_segredos, n_processos=None, semente=0, tamanho_bloco=8):
+    # Joga todas as palavras iniciais contra a mesma sequência de segredos: ids dos segredos e
+    # matriz (palavra inicial x segredo) de tentativas
+    start = time.time()
+    carregar_matriz()
+    ids_segredos = segredos_fixos(n_segredos, semente)
+    tentativas = np.empty((len(palavras), n_segredos), dtype=np.uint8)
+    ids = np.arange(len(palavras))
+    feitas = 0
+
+    with ProcessPoolExecutor(max_workers=n_processos or os.cpu_count(), initializer=inicializar_processo) as executor:
+        for ids_iniciais, tentativas_sublista in executar_em_blocos(executor, tentativas_em_sublista, ids,
+                                                                    tamanho_bloco, ids_segredos):
+            tentativas[ids_iniciais] = tentativas_sublista
+            feitas += len(ids_iniciais)
+            print(f"{feitas}/{len(palavras)} palavras avaliadas.")
+
+    print(f"Tempo total: {time.time() - start:.5f}s")
+    return {"segredos": ids_segredos, "tentativas": tentativas}
+
+
+def matriz_tentativas_pareada(n_segredos, n_processos=None, semente=0, tamanho_bloco=8):
+    # Matriz de construir_tentativas_pareadas, guardada em dados/ (o nome muda com melhor_tentativa,
+    # que é quem joga depois da palavra inicial). Retorna (ids dos segredos, matriz).
+    caminho = caminho_gerado("tentativas_pareadas", melhor_tentativa, False, str(n_segredos), str(semente))
+    dados = carregar_ou_construir(caminho, construir_tentativas_pareadas, n_segredos, n_processos, semente,
+                                  tamanho_bloco)
+    return dados["segredos"], dados["tentativas"]
+
+
+def diferenca_pareada(tentativas, id_a, id_b):
+    # Diferença média de tentativas (a - b) nos mesmos segredos e a meia-largura do intervalo de 95%.
+    # Como a variância do segredo se cancela, o intervalo é bem menor que o de duas médias independentes.
+    diferencas = tentativas[id_a].astype(np.int16) - tentativas[id_b]
+    return diferencas.mean(), 1.96 * diferencas.std(ddof=1) / len(diferencas) ** 0.5
+
+
+def tentativas_subarvore(ids_possiveis, tentativa, estrategia=melhor_tentativa_posicional, max_tentativas=6):
+    # Soma exata das tentativas usadas para todos os segredos em ids_possiveis, jogando a partir
+    # da tentativa de número `tentativa` (quem não é acertado até max_tentativas conta como 7)
+    n = len(ids_possiveis)
+    if n <= 2:
+        # A estratégia chuta um dos candidatos: acerta um agora e o outro na próxima
+        return tentativa + (0 if n == 1 else min(tentativa + 1, max_tentativas + 1))
+
+    id_tentativa = estrategia(ids_possiveis)
+    total = 0
+    for codigo, grupo in separar_por_feedback(ids_possiveis, id_tentativa):
+        if codigo == TODOS_VERDES:
+            total += tentativa
+        elif tentativa == max_tentativas:
+            total += (max_tentativas + 1) * len(grupo)
+        else:
+            total += tentativas_subarvore(grupo, tentativa + 1, estrategia, max_tentativas)
+    return total
+
+
+def media_exata_palavra_inicial(palavra_inicial, estrategia=melhor_tentativa_posicional):
+    # Joga a palavra inicial contra todas as palavras secretas de uma vez: cada grupo de feedback
+    # é resolvido uma vez só
+    ids = np.arange(len(palavras))
+    total = 0
+    for codigo, grupo in separar_por_feedback(ids, id_palavra[palavra_inicial]):
+        total += 1 if codigo == TODOS_VERDES else tentativas_subarvore(grupo, 2, estrategia)
+    return total / len(ids)
+
+
+def ranking_exato_em_sublista(ids_iniciais):
+    return [(palavras[i], media_exata_palavra_inicial(palavras[i])) for i in ids_iniciais], uso_memoria()
+
+
+def ranking_exato(n_processos=None, tamanho_bloco=8):
+    # Média exata de cada palavra inicial contra todas as palavras secretas, sem amostragem
+    start = time.time()
+    carregar_matriz()
+
+    ranking = []
+    with ProcessPoolExecutor(max_workers=n_processos or os.cpu_count(), initializer=inicializar_processo) as executor:
+        for sublista_resultado, memoria in executar_em_blocos(executor, ranking_exato_em_sublista, np.arange(len(palavras)),
+                                                              tamanho_bloco):
+            ranking.extend(sublista_resultado)
+            print(f"{len(ranking)}/{len(palavras)} palavras avaliadas. {descrever_memoria(memoria)}")
+
+    ranking.sort(key=lambda x: x[1])
+    elapsed = time.time() - start
+    print(f"Tempo total: {elapsed:.5f}s")
+    print(f'Média por palavra: {elapsed / len(palavras):.5f}s')
+    return ranking
+
+
 if __name__ == "__main__":
     n_simulacoes = 200
-    n_processos = 60
-    melhores_palavras = encontrar_melhor_palavra_inicial(n_simulacoes, n_processos)
+    n_processos = None  # None: um processo por núcleo (os.cpu_count())
+    exato = False  # True: média exata de cada palavra contra todas as secretas, sem Monte Carlo
+    corrida = False  # True: successive halving, descartando a pior metade a cada rodada
+    n_inicial, top_k = 8, 100
+    pareado = False  # True: todas as palavras jogam contra a mesma sequência sorteada de segredos
+    if pareado:
+        _, tentativas = matriz_tentativas_pareada(n_simulacoes, n_processos)
+        medias = tentativas.mean(axis=1)
+        ordem = np.argsort(medias, kind="stable")
+        melhores_palavras = [(palavras[i], medias[i]) for i in ordem]
+        for i in ordem[1:11]:
+            diferenca, intervalo = diferenca_pareada(tentativas, i, ordem[0])
+            print(f"{palavras[i]} - {palavras[ordem[0]]}: {diferenca:+.4f} ± {intervalo:.4f}")
+    elif exato:
+        melhores_palavras = ranking_exato(n_processos)
+    elif corrida:
+        melhores_palavras = corrida_eliminatoria(n_inicial, top_k, n_processos)
+        for palavra, media, intervalo in melhores_palavras:
+            print(f"{palavra}: {media:.4f} ± {intervalo:.4f}")
+    else:
+        melhores_palavras = encontrar_melhor_palavra_inicial(n_simulacoes, n_processos)
     print("As 100 melhores palavras iniciais de acordo com o teste são:")
-    top_100 = []
-    for palavras in melhores_palavras[:100][0]:
-        top_100.append(palavras)
+    top_100 = [palavra for palavra, *_ in melhores_palavras[:100]]
     print(top_100)
 
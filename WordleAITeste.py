@@ -1,89 +1,28 @@
+import os
 import random
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 import time
 import matplotlib.pyplot as plt
+import numpy as np
 
-from lista import palavras, melhor_palavra
+from lista import melhor_palavra
+from lista_binaria import palavras, palavras_por_tamanho, ids_por_tamanho
+from arvore import carregar_arvore, jogar_com_arvore
+from abertura import carregar_livro, segunda_jogada
+from transposicao import CacheJogadas, caminho_cache, memorizar
+from estrategias import melhor_tentativa_frequencia
+from padroes import feedback, filtrar_ids, carregar_matriz, id_palavra, TODOS_VERDES
+from indice import sobreviventes
+from paralelo import inicializar_processo, executar_em_blocos, contexto
 
 
 # Funções auxiliares
 def escolher_palavra(tamanho=None):
-    palavras_filtradas = [p.lower() for p in palavras if len(p) == (tamanho if tamanho else len(palavras[0]))]
-    return random.choice(palavras_filtradas)
+    return random.choice(palavras_por_tamanho[tamanho or len(palavras[0])])
 
 
-def verificar_palavra(palavra_secreta, tentativa):
-    palavra_secreta = palavra_secreta.lower()
-    tentativa = tentativa.lower()
-
-    if len(palavra_secreta) != len(tentativa):
-        raise ValueError("A tentativa e a palavra secreta devem ter o mesmo comprimento.")
-
-    resultado = ["⬜"] * len(tentativa)
-    palavra_secreta_lista = list(palavra_secreta)
-    tentativa_lista = list(tentativa)
-
-    for i, letra in enumerate(tentativa):
-        if letra == palavra_secreta[i]:
-            resultado[i] = "🟩"
-            palavra_secreta_lista[i] = None
-            tentativa_lista[i] = None
-
-    for i, letra in enumerate(tentativa):
-        if tentativa_lista[i] is not None:
-            if letra in palavra_secreta_lista:
-                resultado[i] = "🟨"
-                palavra_secreta_lista[palavra_secreta_lista.index(letra)] = None
-
-    return "".join(resultado)
-
-
-def filtrar_palavras(lista_palavra, tentativa, resultado):
-    tentativa = tentativa.lower()
-    resultado = resultado.lower()
-    palavras_filtradas = []
-
-    for palavra in lista_palavra:
-        palavra = palavra.lower()
-        letras_confirmadas = {}
-        letras_invalidas = set()
-        palavra_valida = True
-
-        for i, letra in enumerate(tentativa):
-            if resultado[i] == "🟩":
-                if palavra[i] != letra:
-                    palavra_valida = False
-                    break
-                letras_confirmadas[letra] = letras_confirmadas.get(letra, 0) + 1
-
-        if not palavra_valida:
-            continue
-
-        for i, letra in enumerate(tentativa):
-            if resultado[i] == "🟨":
-                if letra not in palavra or palavra[i] == letra:
-                    palavra_valida = False
-                    break
-                letras_confirmadas[letra] = letras_confirmadas.get(letra, 0) + 1
-
-        if not palavra_valida:
-            continue
-
-        for i, letra in enumerate(tentativa):
-            if resultado[i] == "⬜":
-                if letra in palavra:
-                    if palavra.count(letra) > letras_confirmadas.get(letra, 0):
-                        palavra_valida = False
-                        break
-                    letras_invalidas.add(letra)
-
-        if palavra_valida:
-            palavras_filtradas.append(palavra)
-
-    return palavras_filtradas
-
-
-def melhor_tentativa(palavras_possiveis):
+def melhor_tentativa(palavras_possiveis, palavras_chute=None):
     if not palavras_possiveis:
         return ""
 
@@ -102,42 +41,77 @@ def melhor_tentativa(palavras_possiveis):
         return score
 
     # Retorna a palavra com a maior pontuação
-    return max(palavras_possiveis, key=pontuar_palavra)
+    if palavras_chute is None or len(palavras_possiveis) <= 2:
+        return max(palavras_possiveis, key=pontuar_palavra)
 
+    # Chute vindo de palavras_chute (ex.: a lista completa), pontuado pelas palavras possíveis;
+    # em caso de empate prefere uma palavra que ainda pode ser a secreta
+    possiveis = set(palavras_possiveis)
+    return max(palavras_chute, key=lambda palavra: (pontuar_palavra(palavra), palavra in possiveis))
+
+
+def jogar_wordle(ia_jogar=False, estrategia=None, chute_completo=False, arvore=None, palavra_secreta=None, livro=None):
+    # estrategia: função que recebe os ids possíveis (e os ids de chute) e devolve o id do chute;
+    # None usa melhor_tentativa. Com chute_completo a IA pode chutar qualquer palavra da lista.
+    # arvore: árvore de decisão pré-calculada (arvore.py); a IA só a percorre, sem pontuar palavras.
+    # livro: livro de abertura (abertura.py) da mesma estratégia; a segunda jogada vira uma consulta.
+    # Retorna o número de tentativas usadas, ou 7 se a IA não acertar em 6.
+    palavra_secreta = palavra_secreta or escolher_palavra()
+    if ia_jogar and arvore is not None:
+        return jogar_com_arvore(arvore, id_palavra[palavra_secreta])
 
-def jogar_wordle(ia_jogar=False):
-    palavra_secreta = escolher_palavra()
     tentativas = []
     tentativa_atual = ""
     tentativas_restantes = 6
     fim_de_jogo = False
-    palavras_possiveis = [p for p in palavras if len(p) == len(palavra_secreta)]
+    ids_possiveis = ids_por_tamanho[len(palavra_secreta)]
+    ids_chute = np.arange(len(palavras)) if chute_completo else None
 
     while True:
         if ia_jogar and not fim_de_jogo:
             if tentativas_restantes == 6:
                 tentativa_atual = melhor_palavra[0]
+            elif tentativas_restantes == 5 and livro is not None:
+                tentativa_atual = palavras[id_segunda]
             else:
-                if palavras_possiveis:
-                    tentativa_atual = melhor_tentativa(palavras_possiveis)
+                if len(ids_possiveis):
+                    if estrategia is None:
+                        tentativa_atual = melhor_tentativa([palavras[i] for i in ids_possiveis],
+                                                           palavras if chute_completo else None)
+                    else:
+                        tentativa_atual = palavras[estrategia(ids_possiveis, ids_chute)]
 
             if tentativa_atual:
-                resultado = verificar_palavra(palavra_secreta, tentativa_atual)
+                id_tentativa = id_palavra[tentativa_atual]
+                resultado = feedback(id_tentativa, id_palavra[palavra_secreta])
                 tentativas.append((tentativa_atual, resultado))
                 tentativas_restantes -= 1
-                palavras_possiveis = filtrar_palavras(palavras_possiveis, tentativa_atual, resultado)
-
-                if tentativa_atual == palavra_secreta or tentativas_restantes == 0:
+                if tentativas_restantes == 5 and livro is not None and resultado != TODOS_VERDES:
+                    ids_possiveis, id_segunda = segunda_jogada(livro, resultado)
+                elif tentativas_restantes == 5:
+                    # Primeira jogada: os candidatos são a lista inteira, então o índice já tem a resposta
+                    ids_possiveis = sobreviventes(id_tentativa, resultado)
+                else:
+                    ids_possiveis = filtrar_ids(ids_possiveis, id_tentativa, resultado)
+
+                if tentativa_atual == palavra_secreta:
                     return 6 - tentativas_restantes
+                if tentativas_restantes == 0:
+                    return 7
                 tentativa_atual = ""
 
 
-def simular_jogos(n):
+def simular_jogos(n, estrategia=None, chute_completo=False, arvore=None, livro=None, cache=None):
+    # cache: CacheJogadas compartilhado por todos os jogos (e entre chamadas); a estratégia só é
+    # calculada para conjuntos de candidatos que ainda não apareceram
     start = time.time()
     vitorias_por_tentativas = []
+    if cache is not None:
+        estrategia = memorizar(estrategia or melhor_tentativa_frequencia, cache)
 
     for i in range(n):
-        tentativas_usadas = jogar_wordle(ia_jogar=True)
+        tentativas_usadas = jogar_wordle(ia_jogar=True, estrategia=estrategia, chute_completo=chute_completo,
+                                         arvore=arvore, livro=livro)
         vitorias_por_tentativas.append(tentativas_usadas)
         porcentagem = (i/n)*100
         if porcentagem % 5 == 0:
@@ -147,27 +121,89 @@ def simular_jogos(n):
     tempo_medio = elapsed / n
     print(f"Tempo para executar todos os jogos: {elapsed:.5f}")
     print(f"Tempo médio de execução por jogo: {tempo_medio:.5f}")
+    if cache is not None:
+        print(f"Cache de jogadas: {cache.estatisticas()}")
     return vitorias_por_tentativas
 
 
-# Configurar o número de jogos para simular
-numero_de_jogos = 2000
-resultados = simular_jogos(numero_de_jogos)
-media_melhor_palavra = sum(resultados)/numero_de_jogos
-print(f'Média de tentativas da palavra {melhor_palavra[0]}: {media_melhor_palavra}')
+def jogar_segredos(ids_secretas, estrategia=None, chute_completo=False):
+    # Tarefa de um processo: (ids do bloco, tentativas usadas em cada um). A árvore e o livro de
+    # abertura, se houver, vêm do initializer do processo
+    arvore, livro = contexto.get("arvore"), contexto.get("livro")
+    return ids_secretas, [jogar_wordle(ia_jogar=True, estrategia=estrategia, chute_completo=chute_completo, arvore=arvore,
+                         palavra_secreta=palavras[i], livro=livro) for i in ids_secretas]
 
-# Contar o número de vitórias por número de tentativas
-contagem_vitorias = Counter(resultados)
 
-# Plotar gráfico
-tentativas = list(contagem_vitorias.keys())
-vitorias = [contagem_vitorias[t] for t in tentativas]
+def avaliar_todas_as_palavras(estrategia=None, chute_completo=False, arvore=None, n_processos=None, livro=None,
+                              tamanho_bloco=32):
+    # Avaliação exaustiva: joga cada palavra da lista exatamente uma vez, dividindo as palavras
+    # em blocos pequenos entre os processos. O resultado é exato e não muda entre execuções.
+    start = time.time()
+    # Garante que a matriz existe antes de criar os processos; cada um abre o arquivo com memmap
+    carregar_matriz()
+    n_processos = n_processos or os.cpu_count()
+    resultados = np.zeros(len(palavras), dtype=np.uint8)
+    avaliadas = 0
+
+    # A árvore e o livro vão uma vez para cada processo; as tarefas só levam os ids das secretas
+    with ProcessPoolExecutor(max_workers=n_processos, initializer=inicializar_processo,
+                             initargs=({"arvore": arvore, "livro": livro},)) as executor:
+        for ids_bloco, tentativas_bloco in executar_em_blocos(executor, jogar_segredos, np.arange(len(palavras)),
+                                                              tamanho_bloco, estrategia, chute_completo):
+            resultados[ids_bloco] = tentativas_bloco
+            avaliadas += len(ids_bloco)
+            print(f"{avaliadas}/{len(palavras)} palavras avaliadas.")
 
-plt.figure(figsize=(10, 7))
-plt.bar(tentativas, vitorias, color='skyblue')
-plt.xlabel('Número de Tentativas')
-plt.ylabel('Número de Vitórias')
-plt.title('Número de Vitórias por Número de Tentativas')
-plt.xticks(tentativas)
-plt.grid(axis='y')
-plt.show()
+    elapsed = time.time() - start
+    contagem = Counter(resultados.tolist())
+    falhas = [palavras[i] for i in np.flatnonzero(resultados > 6)]
+    print(f"Tempo para avaliar todas as {len(palavras)} palavras: {elapsed:.5f}s")
+    print(f"Média exata de tentativas: {resultados.mean():.5f}")
+    print(f"Distribuição: {dict(sorted(contagem.items()))}")
+    print(f"Falhas ({len(falhas)}): {falhas}")
+    return resultados.tolist()
+
+
+if __name__ == "__main__":
+    # Configurar o número de jogos para simular
+    numero_de_jogos = 2000
+    # None: melhor_tentativa (frequência); ou, importando de estrategias, melhor_tentativa_entropia,
+    # melhor_tentativa_esperada (menos candidatos restantes em média) ou melhor_tentativa_minimax (menor pior caso)
+    estrategia = None
+    chute_completo = False  # True: a IA pode chutar qualquer palavra da lista, não só as possíveis
+    usar_arvore = False  # True: pré-calcula a árvore de decisão da estratégia e só a percorre em cada jogo
+    arvore = None
+    if usar_arvore:
+        arvore = carregar_arvore(melhor_palavra[0], estrategia or melhor_tentativa_frequencia, chute_completo)
+    usar_livro = False  # True: a segunda jogada vem do livro de abertura (calculado uma vez por lista e estratégia)
+    livro = carregar_livro(melhor_palavra[0], estrategia or melhor_tentativa_frequencia, chute_completo) if usar_livro else None
+    usar_cache = False  # True: reaproveita a jogada de conjuntos de candidatos já vistos (salvo em dados/)
+    cache = None
+    if usar_cache:
+        cache = CacheJogadas()
+        cache.carregar(caminho_cache(estrategia or melhor_tentativa_frequencia, chute_completo))
+    exaustivo = False  # True: joga cada palavra da lista uma vez, em todos os núcleos (média exata)
+    if exaustivo:
+        resultados = avaliar_todas_as_palavras(estrategia, chute_completo, arvore, livro=livro)
+    else:
+        resultados = simular_jogos(numero_de_jogos, estrategia, chute_completo, arvore, livro, cache)
+        if cache is not None:
+            cache.salvar(caminho_cache(estrategia or melhor_tentativa_frequencia, chute_completo))
+    media_melhor_palavra = sum(resultados)/len(resultados)
+    print(f'Média de tentativas da palavra {melhor_palavra[0]}: {media_melhor_palavra}')
+
+    # Contar o número de vitórias por número de tentativas
+    contagem_vitorias = Counter(resultados)
+
+    # Plotar gráfico
+    tentativas = list(contagem_vitorias.keys())
+    vitorias = [contagem_vitorias[t] for t in tentativas]
+
+    plt.figure(figsize=(10, 7))
+    plt.bar(tentativas, vitorias, color='skyblue')
+    plt.xlabel('Número de Tentativas (7 = não acertou)')
+    plt.ylabel('Número de Vitórias')
+    plt.title('Número de Vitórias por Número de Tentativas')
+    plt.xticks(tentativas)
+    plt.grid(axis='y')
+    plt.show()
@@ -0,0 +1,55 @@
+import time
+
+import numpy as np
+
+from lista import melhor_palavra
+from lista_binaria import N_PALAVRAS
+from estrategias import melhor_tentativa_frequencia
+from padroes import id_palavra, separar_por_feedback, caminho_gerado, carregar_ou_construir, TODOS_VERDES
+
+
+# Livro de abertura: com a palavra inicial fixa só existem até 243 feedbacks na primeira jogada,
+# então a segunda jogada de cada um é calculada uma vez e guardada em arrays:
+#   codigos[k]    -> feedback da palavra inicial (em ordem crescente, sem o 🟩🟩🟩🟩🟩)
+#   segundos[k]   -> id da segunda tentativa para esse feedback
+#   inicios[k]    -> onde começam os ids possíveis desse feedback em `ids`
+#   ids           -> os ids possíveis de todos os feedbacks, um grupo depois do outro
+def construir_livro(palavra_inicial=None, estrategia=melhor_tentativa_frequencia, chute_completo=False):
+    start = time.time()
+    id_inicial = id_palavra[palavra_inicial or melhor_palavra[0]]
+    ids_chute = np.arange(N_PALAVRAS) if chute_completo else None
+
+    # O grupo 🟩🟩🟩🟩🟩 (só a própria palavra) fica de fora
+    grupos = [(codigo, grupo) for codigo, grupo in separar_por_feedback(np.arange(N_PALAVRAS), id_inicial)
+              if codigo != TODOS_VERDES]
+    segundos = [estrategia(grupo, ids_chute) for _, grupo in grupos]
+    livro = {
+        "codigos": np.array([codigo for codigo, _ in grupos], dtype=np.uint8),
+        "segundos": np.array(segundos, dtype=np.uint16),
+        "inicios": np.cumsum([0] + [len(grupo) for _, grupo in grupos]).astype(np.uint32),
+        "ids": np.concatenate([grupo for _, grupo in grupos]).astype(np.uint16),
+    }
+    print(f"Livro de abertura com {len(segundos)} feedbacks construído em {time.time() - start:.1f}s")
+    return livro
+
+
+def caminho_livro(palavra_inicial, estrategia, chute_completo):
+    return caminho_gerado("abertura", estrategia, chute_completo, palavra_inicial)
+
+
+def carregar_livro(palavra_inicial=None, estrategia=melhor_tentativa_frequencia, chute_completo=False):
+    # Lê o livro do disco ou constrói e salva na primeira vez
+    palavra_inicial = palavra_inicial or melhor_palavra[0]
+    return carregar_ou_construir(caminho_livro(palavra_inicial, estrategia, chute_completo), construir_livro,
+                                 palavra_inicial, estrategia, chute_completo)
+
+
+def segunda_jogada(livro, codigo):
+    # (ids possíveis, id da segunda tentativa) depois do feedback `codigo` da palavra inicial
+    k = np.searchsorted(livro["codigos"], codigo)
+    ids_possiveis = livro["ids"][livro["inicios"][k]:livro["inicios"][k + 1]].astype(np.intp)
+    return ids_possiveis, int(livro["segundos"][k])
+
+
+if __name__ == "__main__":
+    carregar_livro()
@@ -0,0 +1,78 @@
+import time
+
+import numpy as np
+
+from lista import melhor_palavra
+from lista_binaria import N_PALAVRAS
+from estrategias import melhor_tentativa_frequencia
+from padroes import feedback, id_palavra, separar_por_feedback, caminho_gerado, carregar_ou_construir, N_PADROES, \
+    TODOS_VERDES
+
+
+# A árvore é guardada em três arrays:
+#   chutes[no]  -> id da palavra chutada naquele nó (o nó 0 é a palavra inicial)
+#   chaves[k]   -> no * 243 + feedback, em ordem crescente
+#   filhos[k]   -> nó seguinte para essa chave
+# Como a estratégia é determinística, o jogo inteiro vira um caminho nessa árvore.
+def construir_arvore(palavra_inicial=None, estrategia=melhor_tentativa_frequencia, chute_completo=False):
+    start = time.time()
+    id_inicial = id_palavra[palavra_inicial or melhor_palavra[0]]
+    ids_chute = np.arange(N_PALAVRAS) if chute_completo else None
+    chutes = []
+    arestas = []
+
+    # Pilha de (nó, ids possíveis); os ids ficam em ordem crescente, como em jogar_wordle
+    pilha = [(0, np.arange(N_PALAVRAS))]
+    chutes.append(id_inicial)
+    while pilha:
+        no, ids_possiveis = pilha.pop()
+        id_tentativa = chutes[no]
+        for codigo, ids_filho in separar_por_feedback(ids_possiveis, id_tentativa):
+            if codigo == TODOS_VERDES:
+                continue
+            filho = len(chutes)
+            chutes.append(estrategia(ids_filho, ids_chute))
+            arestas.append((no * N_PADROES + codigo, filho))
+            pilha.append((filho, ids_filho))
+
+    arestas.sort()
+    arvore = {
+        "chutes": np.array(chutes, dtype=np.uint16),
+        "chaves": np.array([chave for chave, _ in arestas], dtype=np.int64),
+        "filhos": np.array([filho for _, filho in arestas], dtype=np.uint32),
+    }
+    print(f"Árvore com {len(chutes)} nós construída em {time.time() - start:.1f}s")
+    return arvore
+
+
+def caminho_arvore(palavra_inicial, estrategia, chute_completo):
+    return caminho_gerado("arvore", estrategia, chute_completo, palavra_inicial)
+
+
+def carregar_arvore(palavra_inicial=None, estrategia=melhor_tentativa_frequencia, chute_completo=False):
+    # Lê a árvore do disco ou constrói e salva na primeira vez
+    palavra_inicial = palavra_inicial or melhor_palavra[0]
+    return carregar_ou_construir(caminho_arvore(palavra_inicial, estrategia, chute_completo), construir_arvore,
+                                 palavra_inicial, estrategia, chute_completo)
+
+
+def proximo_no(arvore, no, codigo):
+    k = np.searchsorted(arvore["chaves"], no * N_PADROES + codigo)
+    return int(arvore["filhos"][k])
+
+
+def jogar_com_arvore(arvore, id_secreta, max_tentativas=6):
+    # Joga só percorrendo a árvore, sem pontuar nenhuma palavra. Retorna as tentativas usadas,
+    # ou max_tentativas + 1 se não acertar (como jogar_wordle)
+    no = 0
+    for tentativa in range(1, max_tentativas + 1):
+        codigo = feedback(int(arvore["chutes"][no]), id_secreta)
+        if codigo == TODOS_VERDES:
+            return tentativa
+        if tentativa < max_tentativas:
+            no = proximo_no(arvore, no, codigo)
+    return max_tentativas + 1
+
+
+if __name__ == "__main__":
+    carregar_arvore()
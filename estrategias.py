@@ -0,0 +1,148 @@
+import numpy as np
+
+from lista_binaria import N_PALAVRAS
+from padroes import carregar_matriz, N_PADROES, TAMANHO_PALAVRA
+from indice import conjuntos_letras, codigos_palavras, letra_na_posicao, MAX_LETRAS
+
+
+# Limite de células (chutes x candidatos) processadas por vez, para não estourar a memória
+CELULAS_POR_BLOCO = 1 << 22
+
+# Com a lista completa a resposta nunca muda, então ela é calculada uma vez só
+_jogada_lista_completa = {}
+
+# Letras repetidas de cada palavra (len(palavra) - len(set(palavra))), usado por melhor_tentativa_frequencia:
+# o tamanho do conjunto é o número de bits ligados no conjunto de letras de 27 bits
+_letras_distintas = np.unpackbits(conjuntos_letras.view(np.uint8)).reshape(len(conjuntos_letras), -1).sum(axis=1)
+repeticoes = TAMANHO_PALAVRA - _letras_distintas.astype(np.int64)
+
+
+def contar_particoes(ids_chute, ids_possiveis):
+    # Avaliador de partições: para cada chute, quantos candidatos caem em cada um dos 243
+    # feedbacks. Retorna uma matriz (chutes, 243) de contagens.
+    matriz = np.asarray(carregar_matriz())
+    ids_chute = np.asarray(ids_chute)
+    ids_possiveis = np.asarray(ids_possiveis)
+    n = len(ids_possiveis)
+    contagens = np.empty((len(ids_chute), N_PADROES), dtype=np.int32)
+    tamanho_bloco = max(1, CELULAS_POR_BLOCO // max(n, 1))
+    deslocamentos = np.arange(tamanho_bloco)[:, None] * N_PADROES
+    codigos = np.empty((min(tamanho_bloco, len(ids_chute)), n), dtype=np.intp)
+
+    for inicio in range(0, len(ids_chute), tamanho_bloco):
+        bloco = ids_chute[inicio:inicio + tamanho_bloco]
+        g = len(bloco)
+        # Com poucos candidatos é mais barato buscar só as células; com muitos, copiar as linhas inteiras
+        if n * 10 < len(matriz):
+            linhas = matriz[np.ix_(bloco, ids_possiveis)]
+        else:
+            linhas = np.take(matriz[bloco], ids_possiveis, axis=1)
+        # Cada linha ganha um deslocamento de 243 para que um único bincount conte todos os chutes
+        np.add(linhas, deslocamentos[:g], out=codigos[:g])
+        contagens[inicio:inicio + g] = np.bincount(codigos[:g].ravel(), minlength=g * N_PADROES).reshape(g, N_PADROES)
+
+    return contagens
+
+
+def entropias(ids_chute, ids_possiveis):
+    # Entropia esperada (em bits) da partição que cada chute induz sobre os candidatos:
+    # H = log2(n) - sum(c * log2(c)) / n, com c o tamanho de cada grupo de feedback
+    n = len(ids_possiveis)
+    c_log_c = np.arange(n + 1) * np.log2(np.maximum(np.arange(n + 1), 1))
+    return np.log2(n) - c_log_c[contar_particoes(ids_chute, ids_possiveis)].sum(axis=1) / n
+
+
+def _escolher(ids_chute, ids_possiveis, pontuacao):
+    # Maior pontuação; em caso de empate, prefere um chute que ainda pode ser a palavra secreta
+    empatados = pontuacao >= pontuacao.max() - 1e-9
+    possiveis = empatados & np.isin(ids_chute, ids_possiveis)
+    return int(ids_chute[np.argmax(possiveis if possiveis.any() else empatados)])
+
+
+def tamanhos_esperados(ids_chute, ids_possiveis):
+    # Número esperado de candidatos que sobram depois de cada chute: sum(c²) / n
+    contagens = contar_particoes(ids_chute, ids_possiveis).astype(np.int64)
+    return (contagens * contagens).sum(axis=1) / len(ids_possiveis)
+
+
+def maiores_grupos(ids_chute, ids_possiveis):
+    # Tamanho do maior grupo de feedback de cada chute (o pior caso da próxima jogada), junto
+    # com sum(c²) para desempatar
+    contagens = contar_particoes(ids_chute, ids_possiveis).astype(np.int64)
+    return contagens.max(axis=1), (contagens * contagens).sum(axis=1)
+
+
+def _melhor_por_particao(ids_possiveis, ids_chute, nome, pontuar):
+    # Parte comum das estratégias baseadas em partição: chute entre os candidatos por padrão ou
+    # entre ids_chute, memo da lista completa e desempate por _escolher (maior pontuação)
+    ids_possiveis = np.asarray(ids_possiveis)
+    if not len(ids_possiveis):
+        return None
+    if ids_chute is None or len(ids_possiveis) <= 2:
+        ids_chute = ids_possiveis
+    ids_chute = np.asarray(ids_chute)
+
+    lista_completa = len(ids_possiveis) == N_PALAVRAS
+    if lista_completa and nome in _jogada_lista_completa:
+        return _jogada_lista_completa[nome]
+
+    melhor = _escolher(ids_chute, ids_possiveis, pontuar(ids_chute, ids_possiveis))
+    if lista_completa:
+        _jogada_lista_completa[nome] = melhor
+    return melhor
+
+
+def melhor_tentativa_entropia(ids_possiveis, ids_chute=None):
+    # Escolhe o chute que maximiza a informação esperada. Por padrão chuta só entre os
+    # candidatos; com ids_chute (ex.: a lista completa) pontua esses chutes contra os candidatos.
+    return _melhor_por_particao(ids_possiveis, ids_chute, "entropia", entropias)
+
+
+def melhor_tentativa_esperada(ids_possiveis, ids_chute=None):
+    # Escolhe o chute que minimiza o número esperado de candidatos restantes
+    return _melhor_por_particao(ids_possiveis, ids_chute, "esperada",
+                                lambda ids_chute, ids_possiveis: -tamanhos_esperados(ids_chute, ids_possiveis))
+
+
+def melhor_tentativa_minimax(ids_possiveis, ids_chute=None):
+    # Escolhe o chute cujo maior grupo de feedback é o menor possível (garantia de pior caso);
+    # entre esses, o de menor sum(c²)
+    def pontuar(ids_chute, ids_possiveis):
+        maiores, somas_quadrados = maiores_grupos(ids_chute, ids_possiveis)
+        n = len(ids_possiveis)
+        return -(maiores * (n * n + 1) + somas_quadrados)
+
+    return _melhor_por_particao(ids_possiveis, ids_chute, "minimax", pontuar)
+
+
+def _melhor_posicional(ids_possiveis, ids_chute, bonus_repeticao):
+    # Soma das frequências de cada letra na sua posição entre os candidatos
+    ids_possiveis = np.asarray(ids_possiveis)
+    if not len(ids_possiveis):
+        return None
+    if ids_chute is None or len(ids_possiveis) <= 2:
+        ids_chute = ids_possiveis
+    ids_chute = np.asarray(ids_chute)
+
+    pontuacao = np.zeros(len(ids_chute), dtype=np.int64)
+    if bonus_repeticao:
+        pontuacao += repeticoes[ids_chute]
+    # Cada posição sai do código de 25 bits das palavras com um deslocamento e um AND
+    codigos_possiveis = codigos_palavras[ids_possiveis]
+    codigos_chute = codigos_palavras[ids_chute]
+    for i in range(TAMANHO_PALAVRA):
+        contador_posicional = np.bincount(letra_na_posicao(codigos_possiveis, i), minlength=MAX_LETRAS)
+        pontuacao += contador_posicional[letra_na_posicao(codigos_chute, i)]
+
+    return _escolher(ids_chute, ids_possiveis, pontuacao)
+
+
+def melhor_tentativa_frequencia(ids_possiveis, ids_chute=None):
+    # Mesma escolha de melhor_tentativa (Main.py e WordleAITeste.py), mas sobre ids:
+    # frequência posicional mais o número de letras repetidas
+    return _melhor_posicional(ids_possiveis, ids_chute, bonus_repeticao=True)
+
+
+def melhor_tentativa_posicional(ids_possiveis, ids_chute=None):
+    # Mesma escolha de melhor_tentativa de Melhor_palavra.py: só a frequência posicional
+    return _melhor_posicional(ids_possiveis, ids_chute, bonus_repeticao=False)
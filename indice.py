@@ -0,0 +1,111 @@
+import functools
+
+import numpy as np
+
+from padroes import letras, digitos_codigo, linha_feedback, TAMANHO_PALAVRA, CINZA, N_PADROES
+
+
+# Cada letra é representada pelo seu índice no alfabeto da lista (não pelo byte latin-1). Cada
+# palavra também é guardada como um inteiro de 25 bits, 5 bits por letra (a letra da posição i nos
+# bits 5*i a 5*i+4), e o conjunto de letras de uma palavra é um uint32 com um bit por letra, então
+# cabem até 32 letras; a lista tem 27 (a-z e 'ï').
+BITS_POR_LETRA = 5
+MASCARA_LETRA = (1 << BITS_POR_LETRA) - 1
+DESLOCAMENTOS = BITS_POR_LETRA * np.arange(TAMANHO_PALAVRA, dtype=np.uint32)
+MAX_LETRAS = MASCARA_LETRA + 1
+SEM_LETRA = 255
+
+# Bytes latin-1 que aparecem na lista, em ordem; a posição de cada um é o índice da letra
+alfabeto = np.unique(letras)
+if len(alfabeto) > MAX_LETRAS:
+    raise ValueError(f"A lista tem {len(alfabeto)} letras diferentes; o código de 5 bits só comporta {MAX_LETRAS}.")
+
+# Byte latin-1 -> índice da letra (SEM_LETRA para bytes que não aparecem em nenhuma palavra)
+indice_byte = np.full(256, SEM_LETRA, dtype=np.uint8)
+indice_byte[alfabeto] = np.arange(len(alfabeto))
+
+# (N, 5) com o índice de cada letra, o código de 25 bits de cada palavra e o conjunto das letras
+# de cada palavra (bit k ligado se a letra k aparece), todos na ordem dos ids
+letras_indices = indice_byte[letras]
+codigos_palavras = np.bitwise_or.reduce(letras_indices.astype(np.uint32) << DESLOCAMENTOS, axis=1)
+conjuntos_letras = np.bitwise_or.reduce(np.uint32(1) << letras_indices.astype(np.uint32), axis=1)
+
+# Quantas vezes cada letra do alfabeto aparece em cada palavra: (N, 27) de uint8
+contagens_letras = (letras_indices[:, :, None] == np.arange(len(alfabeto))).sum(axis=1, dtype=np.uint8)
+
+# Índice invertido em bitsets: um conjunto de ids é um array de bits empacotados (np.packbits,
+# bit k ligado se o id k está no conjunto), com ~1,3 KB para a lista inteira.
+# bitsets_posicao[i, k]: as palavras com a letra k na posição i, (5, 27, bytes)
+bitsets_posicao = np.packbits(letras_indices.T[:, None, :] == np.arange(len(alfabeto))[:, None], axis=-1)
+conjunto_completo = np.packbits(np.ones(len(letras), dtype=bool))
+
+# Índice (tentativa, feedback) -> sobreviventes na lista inteira: para cada tentativa, os ids em
+# ordem de feedback (uint16) e onde começa cada feedback, ~21 KB por tentativa em vez de um bitset
+# por feedback. É montado da linha da matriz na primeira vez que a tentativa é usada e fica guardado
+# para as tentativas mais recentes (nas simulações a palavra inicial se repete em todos os jogos).
+TENTATIVAS_INDEXADAS = 256
+if len(letras) > np.iinfo(np.uint16).max + 1:
+    raise ValueError("O índice de sobreviventes guarda os ids em uint16.")
+
+
+# Funções auxiliares
+def indice_letra(letra):
+    # Índice da letra no alfabeto, ou SEM_LETRA se ela não aparece na lista
+    return int(indice_byte[ord(letra)]) if ord(letra) < 256 else SEM_LETRA
+
+
+def mascara_conjunto(conjunto, ids):
+    # Máscara dos ids que estão no bitset
+    return np.unpackbits(conjunto, count=len(letras)).view(bool)[ids]
+
+
+@functools.lru_cache(maxsize=TENTATIVAS_INDEXADAS)
+def _particao(id_tentativa):
+    codigos = linha_feedback(id_tentativa, np.arange(len(letras)))
+    ordem = np.argsort(codigos, kind="stable").astype(np.uint16)
+    inicios = np.searchsorted(codigos[ordem], np.arange(N_PADROES + 1)).astype(np.uint32)
+    ordem.flags.writeable = False
+    inicios.flags.writeable = False
+    return ordem, inicios
+
+
+def sobreviventes(id_tentativa, codigo):
+    # ids da lista inteira (em ordem crescente) que dão o feedback `codigo` para a tentativa: uma
+    # fatia do índice, sem recalcular nem comparar feedback nenhum
+    ordem, inicios = _particao(id_tentativa)
+    return ordem[inicios[codigo]:inicios[codigo + 1]].astype(np.intp)
+
+
+def letra_na_posicao(codigos, i):
+    # Índice da letra da posição i de cada código de 25 bits (um deslocamento e um AND)
+    return (codigos >> DESLOCAMENTOS[i]) & MASCARA_LETRA
+
+
+def limites_contagem(tentativa, resultado):
+    # Mínimo e máximo de cada letra do alfabeto observados num feedback: o mínimo é o número de
+    # 🟩 e 🟨 da letra; se a letra também recebeu ⬜, o máximo é esse mesmo número
+    resultado = digitos_codigo(resultado)
+    minimo = np.zeros(len(alfabeto), dtype=np.uint8)
+    maximo = np.full(len(alfabeto), TAMANHO_PALAVRA, dtype=np.uint8)
+    cinzas = []
+    for i, letra in enumerate(tentativa.lower()):
+        indice = indice_letra(letra)
+        if indice == SEM_LETRA:
+            continue
+        if resultado[i] == CINZA:
+            cinzas.append(indice)
+        else:
+            minimo[indice] += 1
+    maximo[cinzas] = minimo[cinzas]
+    return minimo, maximo
+
+
+def mascara_contagem(ids, minimo, maximo):
+    # Máscara dos ids cujas contagens de letras respeitam os limites; só as colunas com alguma
+    # restrição são comparadas
+    ids = np.asarray(ids)
+    colunas = np.flatnonzero((minimo > 0) | (maximo < TAMANHO_PALAVRA))
+    if not len(colunas):
+        return np.ones(len(ids), dtype=bool)
+    contagens = contagens_letras[np.ix_(ids, colunas)]
+    return ((contagens >= minimo[colunas]) & (contagens <= maximo[colunas])).all(axis=1)
@@ -0,0 +1,99 @@
+import hashlib
+import mmap
+import os
+import struct
+
+import numpy as np
+
+
+# Formato binário da lista: um cabeçalho fixo seguido de todas as palavras coladas, cada uma com
+# `largura` bytes (latin-1, para caber o 'ï' em um byte):
+#   4s   identificador b"WPT2"
+#   B    largura (letras por palavra)
+#   3x   reservado
+#   I    quantidade de palavras (little-endian)
+#   20s  sha1 do lista.py de onde o arquivo foi gerado
+# lista.py continua sendo a fonte; o binário é só uma cópia verificada pelo hash, e é dele que
+# todos os módulos (e os processos do pool) leem as palavras, sem importar a lista inteira. A lista
+# de strings `palavras` só é montada quando algum módulo a pede.
+CABECALHO = struct.Struct("<4sB3xI20s")
+IDENTIFICADOR = b"WPT2"
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+CAMINHO_LISTA = os.path.join(PASTA, "lista.py")
+CAMINHO_BINARIO = os.path.join(PASTA, "dados", "palavras.bin")
+
+def hash_lista():
+    with open(CAMINHO_LISTA, "rb") as arquivo:
+        return hashlib.sha1(arquivo.read()).digest()
+
+
+def gerar_arquivo_binario(caminho=CAMINHO_BINARIO):
+    # Converte lista.palavras para o formato binário (é o único ponto que importa lista.py)
+    from lista import palavras
+
+    largura = len(palavras[0])
+    if any(len(palavra) != largura for palavra in palavras):
+        raise ValueError("O formato binário exige que todas as palavras tenham o mesmo comprimento.")
+
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, "wb") as arquivo:
+        arquivo.write(CABECALHO.pack(IDENTIFICADOR, largura, len(palavras), hash_lista()))
+        arquivo.write("".join(palavras).encode("latin-1"))
+
+
+def _arquivo_valido(caminho):
+    # O arquivo precisa ter o identificador, o tamanho que o cabeçalho promete e, se lista.py
+    # existir, o mesmo hash dele
+    if not os.path.exists(caminho):
+        return False
+    with open(caminho, "rb") as arquivo:
+        cabecalho = arquivo.read(CABECALHO.size)
+    if len(cabecalho) < CABECALHO.size:
+        return False
+    identificador, largura, n, hash_fonte = CABECALHO.unpack(cabecalho)
+    if identificador != IDENTIFICADOR or os.path.getsize(caminho) != CABECALHO.size + n * largura:
+        return False
+    return not os.path.exists(CAMINHO_LISTA) or hash_fonte == hash_lista()
+
+
+def carregar_binario(caminho=CAMINHO_BINARIO):
+    # Mapeia o arquivo em memória e devolve (memoryview das palavras, array (N, largura) de uint8),
+    # ambos sem cópia. O arquivo é (re)gerado se não existir ou não corresponder a lista.py.
+    if not _arquivo_valido(caminho):
+        gerar_arquivo_binario(caminho)
+
+    with open(caminho, "rb") as arquivo:
+        mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+    _, largura, n, _ = CABECALHO.unpack_from(mapa)
+    dados = memoryview(mapa)[CABECALHO.size:CABECALHO.size + n * largura]
+    letras = np.frombuffer(mapa, dtype=np.uint8, count=n * largura, offset=CABECALHO.size).reshape(n, largura)
+    return dados, letras
+
+
+dados, letras = carregar_binario()
+N_PALAVRAS = len(letras)
+
+# Índice por tamanho: os ids de cada tamanho num array somente leitura (o formato binário tem
+# largura fixa, então há um tamanho só)
+ids_por_tamanho = {letras.shape[1]: np.arange(N_PALAVRAS)}
+ids_por_tamanho[letras.shape[1]].flags.writeable = False
+
+
+def __getattr__(nome):
+    # `palavras` (a lista de strings de sempre, na mesma ordem, então os ids são os mesmos) e
+    # `palavras_por_tamanho` (as palavras normalizadas, em minúsculas, de cada tamanho numa tupla)
+    # só são montadas no primeiro acesso; quem trabalha só com ids e `letras` não paga por elas
+    if nome == "palavras":
+        texto = letras.tobytes().decode("latin-1")
+        largura = letras.shape[1]
+        globals()["palavras"] = [texto[i:i + largura] for i in range(0, len(texto), largura)]
+        return globals()["palavras"]
+    if nome == "palavras_por_tamanho":
+        globals()["palavras_por_tamanho"] = {letras.shape[1]: tuple(palavra.lower() for palavra in __getattr__("palavras"))}
+        return globals()["palavras_por_tamanho"]
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+
+if __name__ == "__main__":
+    gerar_arquivo_binario()
@@ -0,0 +1,186 @@
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from lista import melhor_palavra
+from lista_binaria import palavras
+from estrategias import contar_particoes
+from padroes import separar_por_feedback, carregar_matriz, id_palavra, TODOS_VERDES
+from paralelo import inicializar_processo
+
+
+# Modo de pesquisa: custo ótimo (soma exata das tentativas sobre todos os segredos, contando
+# max_tentativas + 1 para quem não é acertado, como em tentativas_subarvore) por branch-and-bound.
+# Cada nó é um conjunto de candidatos na tentativa de número `tentativa`; os chutes são testados
+# em ordem de limite inferior e a busca para assim que o limite alcança o melhor custo já achado.
+
+# Conjuntos já resolvidos (por processo): custo exato e chute ótimo, ou só um limite inferior
+# provado quando a busca foi cortada
+_memo_exato = {}
+_memo_limite = {}
+
+
+def _chave(ids, tentativa, chute_completo, largura, max_tentativas):
+    # O memo é global ao processo, então a chave leva todos os parâmetros que mudam o custo
+    return (hashlib.blake2b(ids.tobytes(), digest_size=16).digest(), tentativa, chute_completo, largura,
+            max_tentativas)
+
+
+def limites_inferiores(contagens, tentativa, max_tentativas=6):
+    # Menor custo possível de cada grupo de c candidatos começando na tentativa dada: no máximo
+    # um é acertado nela, os outros precisam de pelo menos mais uma (ou contam como perdidos)
+    seguinte = max_tentativas + 1 if tentativa >= max_tentativas else tentativa + 1
+    return np.where(contagens > 0, tentativa + (contagens - 1) * seguinte, 0)
+
+
+def _custo_trivial(n, tentativa, max_tentativas):
+    # Com 1 ou 2 candidatos, ou na última tentativa, o melhor é chutar um candidato
+    return int(limites_inferiores(np.int64(n), tentativa, max_tentativas))
+
+
+def _grupos_maiores_primeiro(ids, id_tentativa):
+    # Grupos de feedback do maior para o menor (assim os cortes acontecem mais cedo)
+    return sorted(separar_por_feedback(ids, id_tentativa), key=lambda grupo: -len(grupo[1]))
+
+
+def custo_otimo(ids, tentativa=1, limite=np.inf, chute_completo=False, largura=None, max_tentativas=6):
+    # Custo mínimo para resolver todos os ids a partir da tentativa dada. Se o ótimo for menor que
+    # `limite` ele é retornado exato; senão retorna um valor >= limite (a busca foi cortada).
+    # chute_completo: chutes entre todas as palavras, não só entre os candidatos.
+    # largura: testa só os `largura` chutes de menor limite inferior em cada nó (o resultado passa
+    # a ser só um limite superior do ótimo); None é a busca exata.
+    ids = np.asarray(ids)
+    n = len(ids)
+    if n <= 2 or tentativa >= max_tentativas:
+        return _custo_trivial(n, tentativa, max_tentativas)
+
+    chave = _chave(ids, tentativa, chute_completo, largura, max_tentativas)
+    if chave in _memo_exato:
+        return _memo_exato[chave][0]
+    if _memo_limite.get(chave, 0) >= limite:
+        return _memo_limite[chave]
+
+    chutes = np.arange(len(palavras)) if chute_completo else ids
+    contagens = contar_particoes(chutes, ids).astype(np.int64)
+    limites_grupos = limites_inferiores(contagens, tentativa + 1, max_tentativas)
+    limites_grupos[:, TODOS_VERDES] = contagens[:, TODOS_VERDES] * tentativa  # acertado agora
+    limites_chutes = limites_grupos.sum(axis=1)
+
+    # Chutes que deixam todos os candidatos num grupo só e não podem acertar não ajudam em nada
+    uteis = np.flatnonzero((contagens.max(axis=1) < n) | (contagens[:, TODOS_VERDES] > 0))
+    ordem = uteis[np.argsort(limites_chutes[uteis], kind="stable")]
+    if largura is not None:
+        ordem = ordem[:largura]
+
+    melhor, melhor_chute = limite, None
+    for k in ordem:
+        if limites_chutes[k] >= melhor:
+            break
+        # total: custo exato dos grupos já resolvidos mais o limite inferior dos que faltam
+        total = limites_chutes[k]
+        for codigo, grupo in _grupos_maiores_primeiro(ids, chutes[k]):
+            if codigo == TODOS_VERDES:
+                continue
+            limite_grupo = limites_grupos[k, codigo]
+            custo = custo_otimo(grupo, tentativa + 1, melhor - (total - limite_grupo), chute_completo, largura,
+                                max_tentativas)
+            total += custo - limite_grupo
+            if total >= melhor:
+                break
+        if total < melhor:
+            melhor, melhor_chute = total, int(chutes[k])
+
+    if melhor_chute is not None:
+        _memo_exato[chave] = (int(melhor), melhor_chute)
+        return int(melhor)
+    _memo_limite[chave] = max(_memo_limite.get(chave, 0), limite)
+    return limite
+
+
+def chute_otimo(ids, tentativa=1, chute_completo=False, largura=None, max_tentativas=6):
+    # Chute que realiza o custo ótimo do conjunto (resolve o conjunto se ainda não estiver no memo)
+    ids = np.asarray(ids)
+    if len(ids) <= 2 or tentativa >= max_tentativas:
+        return int(ids[0])
+    custo_otimo(ids, tentativa, np.inf, chute_completo, largura, max_tentativas)
+    return _memo_exato[_chave(ids, tentativa, chute_completo, largura, max_tentativas)][1]
+
+
+def custo_grupo(grupo, limite, chute_completo, largura, max_tentativas):
+    # Tarefa de um processo: um grupo de feedback da primeira jogada, a partir da segunda tentativa
+    return custo_otimo(grupo, 2, limite, chute_completo, largura, max_tentativas)
+
+
+def custo_otimo_palavra_inicial(palavra_inicial, chute_completo=False, largura=None, max_tentativas=6,
+                                n_processos=None, limite=np.inf, executor=None):
+    # Custo ótimo com a palavra inicial fixa. Os grupos da primeira jogada são independentes, então
+    # cada um vira uma tarefa no pool. Com `limite` finito a palavra é descartada assim que a soma
+    # dos grupos resolvidos com os limites inferiores dos demais chega nele (retorna None).
+    ids = np.arange(len(palavras))
+    id_inicial = id_palavra[palavra_inicial]
+    grupos = [(codigo, grupo) for codigo, grupo in _grupos_maiores_primeiro(ids, id_inicial) if codigo != TODOS_VERDES]
+    limites = {codigo: _custo_trivial(len(grupo), 2, max_tentativas) for codigo, grupo in grupos}
+    total = (len(ids) - sum(len(grupo) for _, grupo in grupos)) + sum(limites.values())
+    if total >= limite:
+        return None
+
+    proprio_executor = executor is None
+    if proprio_executor:
+        executor = ProcessPoolExecutor(max_workers=n_processos or os.cpu_count(), initializer=inicializar_processo)
+    try:
+        futuros = {executor.submit(custo_grupo, grupo, limite - (total - limites[codigo]), chute_completo, largura,
+                                   max_tentativas): codigo for codigo, grupo in grupos}
+        for futuro in as_completed(futuros):
+            custo = futuro.result()
+            total += custo - limites[futuros[futuro]]
+            if total >= limite:
+                for pendente in futuros:
+                    pendente.cancel()
+                return None
+    finally:
+        if proprio_executor:
+            executor.shutdown(cancel_futures=True)
+    return total
+
+
+def solucao_otima(palavra_inicial=None, chute_completo=False, largura=None, max_tentativas=6, n_processos=None):
+    # Média ótima de tentativas com a palavra inicial dada ou, sem ela, sobre todas as palavras
+    # iniciais (testadas em ordem de limite inferior, cortando as que não podem ganhar)
+    start = time.time()
+    carregar_matriz()
+    ids = np.arange(len(palavras))
+
+    with ProcessPoolExecutor(max_workers=n_processos or os.cpu_count(), initializer=inicializar_processo) as executor:
+        if palavra_inicial is not None:
+            total = custo_otimo_palavra_inicial(palavra_inicial, chute_completo, largura, max_tentativas,
+                                                executor=executor)
+            melhor, melhor_palavra_inicial = total, palavra_inicial
+        else:
+            contagens = contar_particoes(ids, ids).astype(np.int64)
+            limites_grupos = limites_inferiores(contagens, 2, max_tentativas)
+            limites_grupos[:, TODOS_VERDES] = contagens[:, TODOS_VERDES]
+            limites_iniciais = limites_grupos.sum(axis=1)
+            melhor, melhor_palavra_inicial = np.inf, None
+            for i in np.argsort(limites_iniciais, kind="stable"):
+                if limites_iniciais[i] >= melhor:
+                    break
+                total = custo_otimo_palavra_inicial(palavras[i], chute_completo, largura, max_tentativas,
+                                                    limite=melhor, executor=executor)
+                if total is not None:
+                    melhor, melhor_palavra_inicial = total, palavras[i]
+                    print(f"Nova melhor palavra inicial: {palavras[i]} ({total / len(ids):.5f})")
+
+    media = melhor / len(ids)
+    tipo = "ótima" if largura is None else f"com largura {largura} (limite superior)"
+    print(f"Média {tipo} com {melhor_palavra_inicial}: {media:.5f} ({time.time() - start:.1f}s)")
+    return melhor_palavra_inicial, media
+
+
+if __name__ == "__main__":
+    palavra_inicial = melhor_palavra[0]  # None: procura também a melhor palavra inicial
+    chute_completo = False  # True: chutes entre todas as palavras, não só entre os candidatos
+    largura = None  # None: busca exata; um número limita os chutes testados por nó (bem mais rápido)
+    solucao_otima(palavra_inicial, chute_completo, largura)
@@ -0,0 +1,275 @@
+import hashlib
+import inspect
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+import lista_binaria
+from lista_binaria import letras, N_PALAVRAS
+
+
+# Cada feedback é codificado em base 3: o dígito da posição i vale 0 (⬜), 1 (🟨) ou 2 (🟩)
+# e tem peso 3 ** i. O código cabe num uint8 (0 a 242).
+CINZA, AMARELO, VERDE = 0, 1, 2
+EMOJIS = ("⬜", "🟨", "🟩")
+TAMANHO_PALAVRA = 5
+PESOS = 3 ** np.arange(TAMANHO_PALAVRA, dtype=np.uint8)
+TODOS_VERDES = 3 ** TAMANHO_PALAVRA - 1
+N_PADROES = TODOS_VERDES + 1
+
+PASTA_DADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dados")
+
+_matriz = None
+_id_palavra = None
+_assinatura = None
+
+
+def __getattr__(nome):
+    # id_palavra (cada palavra -> seu id, a posição em lista_binaria.palavras) só é montado no
+    # primeiro acesso, porque precisa da lista de strings
+    if nome == "id_palavra":
+        return mapa_ids()
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+
+# Funções auxiliares
+def mapa_ids():
+    global _id_palavra
+    if _id_palavra is None:
+        _id_palavra = {palavra: i for i, palavra in enumerate(lista_binaria.palavras)}
+    return _id_palavra
+
+
+def assinatura_lista():
+    # Hash curto da lista de palavras, usado para invalidar arquivos gerados a partir dela. É o
+    # sha1 de "\n".join(palavras) em UTF-8, calculado direto de `letras` sem montar a lista.
+    global _assinatura
+    if _assinatura is None:
+        linhas = np.hstack([letras, np.full((N_PALAVRAS, 1), ord("\n"), dtype=np.uint8)]).tobytes()[:-1]
+        _assinatura = hashlib.sha1(linhas.decode("latin-1").encode("utf-8")).hexdigest()[:12]
+    return _assinatura
+
+
+def caminho_matriz():
+    return os.path.join(PASTA_DADOS, f"matriz_feedback_{assinatura_lista()}.npy")
+
+
+def assinatura_estrategia(estrategia):
+    # Nome e hash curto de uma estratégia, para nomes de arquivos gerados com ela. O hash cobre o
+    # código do módulo onde ela foi definida (mudar a estratégia ou uma função auxiliar dela
+    # invalida os arquivos), a posição dela no módulo e o bytecode dela (as lambdas têm todas o
+    # mesmo nome)
+    estrategia = inspect.unwrap(estrategia)
+    codigo = getattr(estrategia, "__code__", None)
+    try:
+        fonte = inspect.getsource(inspect.getmodule(estrategia))
+    except (TypeError, OSError):
+        fonte = ""
+    identificacao = f"{estrategia.__module__}.{estrategia.__qualname__}:{codigo.co_firstlineno if codigo else 0}\n"
+    conteudo = (identificacao + fonte).encode("utf-8") + (codigo.co_code if codigo else b"")
+    nome = re.sub(r"\W+", "", estrategia.__name__) or "estrategia"
+    return f"{nome}_{hashlib.sha1(conteudo).hexdigest()[:8]}"
+
+
+def caminho_gerado(prefixo, estrategia, chute_completo, *partes):
+    # Caminho em dados/ de um arquivo gerado por uma estratégia: muda com a estratégia (nome e
+    # código), o modo de chute e a lista de palavras
+    modo = "completo" if chute_completo else "possiveis"
+    nome = "_".join([prefixo, *partes, assinatura_estrategia(estrategia), modo, assinatura_lista()])
+    return os.path.join(PASTA_DADOS, f"{nome}.npz")
+
+
+def carregar_ou_construir(caminho, construir, *args):
+    # Lê um dicionário de arrays salvo em .npz ou constrói com construir(*args) e salva na primeira vez
+    if os.path.exists(caminho):
+        with np.load(caminho) as dados:
+            return {nome: dados[nome] for nome in dados.files}
+
+    resultado = construir(*args)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    np.savez_compressed(caminho, **resultado)
+    return resultado
+
+
+def palavras_para_array(lista_palavras):
+    # Converte as palavras num array (N, 5) de uint8 (um byte latin-1 por letra, inclusive 'ï')
+    return np.frombuffer("".join(lista_palavras).encode("latin-1"), dtype=np.uint8).reshape(-1, TAMANHO_PALAVRA)
+
+
+def digitos_codigo(codigo):
+    # Separa o código nos dígitos de cada posição (CINZA, AMARELO ou VERDE)
+    return [(codigo // 3 ** i) % 3 for i in range(TAMANHO_PALAVRA)]
+
+
+def codigo_de_digitos(digitos):
+    return sum(d * 3 ** i for i, d in enumerate(digitos))
+
+
+def codigo_para_emoji(codigo):
+    # Só usado na interface (pygame/print); o resto do código trabalha com o inteiro
+    return "".join(EMOJIS[d] for d in digitos_codigo(codigo))
+
+
+def calcular_codigo(palavra_secreta, tentativa):
+    # Feedback em Python puro, para tentativas fora da lista. Duas passadas: primeiro os 🟩, depois
+    # os 🟨, cada um consumindo uma ocorrência da letra no segredo
+    palavra_secreta_lista = list(palavra_secreta)
+    digitos = [CINZA] * len(tentativa)
+
+    for i, letra in enumerate(tentativa):
+        if letra == palavra_secreta[i]:
+            digitos[i] = VERDE
+            palavra_secreta_lista[i] = None
+
+    for i, letra in enumerate(tentativa):
+        if digitos[i] != VERDE and letra in palavra_secreta_lista:
+            digitos[i] = AMARELO
+            palavra_secreta_lista[palavra_secreta_lista.index(letra)] = None
+
+    return codigo_de_digitos(digitos)
+
+
+def feedback_vetorizado(tentativa, candidatos):
+    # Feedback de uma tentativa contra todos os candidatos (N, 5) de uma vez, retornando N códigos.
+    # Segue a regra das duas passadas de calcular_codigo: a i-ésima letra só é 🟨 se ainda
+    # sobrar essa letra no segredo fora dos 🟩 depois dos 🟨 dados às posições anteriores.
+    if isinstance(tentativa, str):
+        tentativa = palavras_para_array([tentativa])[0]
+    candidatos = np.asarray(candidatos, dtype=np.uint8)
+    if candidatos.ndim != 2 or candidatos.shape[1] != len(tentativa):
+        raise ValueError("A tentativa e a palavra secreta devem ter o mesmo comprimento.")
+
+    verdes = candidatos == tentativa
+    nao_verdes = ~verdes
+    codigos = (verdes @ (VERDE * PESOS.astype(np.uint16))).astype(np.uint8)
+
+    for i, letra in enumerate(tentativa):
+        disponiveis = ((candidatos == letra) & nao_verdes).sum(axis=1)
+        if not disponiveis.any():
+            continue
+        usadas = nao_verdes[:, :i][:, tentativa[:i] == letra].sum(axis=1)
+        amarelo = nao_verdes[:, i] & (usadas < disponiveis)
+        codigos[amarelo] += PESOS[i] * AMARELO
+
+    return codigos
+
+
+def linha_feedback(id_tentativa, ids=None):
+    # Feedback de uma tentativa contra os ids dados (ou a lista toda). Usa a matriz se ela já
+    # existir em disco; senão calcula só essa linha com o kernel vetorizado.
+    if _matriz is not None or os.path.exists(caminho_matriz()):
+        linha = carregar_matriz()[id_tentativa]
+        return linha if ids is None else linha[ids]
+    return feedback_vetorizado(letras[id_tentativa], letras if ids is None else letras[ids])
+
+
+def filtrar_ids(ids, tentativa, resultado):
+    # Filtro rápido: mantém os ids cujo feedback para a tentativa é igual ao observado.
+    # A tentativa pode ser um id ou uma palavra (palavras fora da lista usam o kernel).
+    ids = np.asarray(ids)
+    if isinstance(tentativa, str):
+        id_tentativa = mapa_ids().get(tentativa)
+        if id_tentativa is None:
+            return ids[feedback_vetorizado(tentativa, letras[ids]) == resultado]
+        tentativa = id_tentativa
+    return ids[linha_feedback(tentativa, ids) == resultado]
+
+
+def separar_por_feedback(ids, id_tentativa):
+    # Agrupa os ids pelo feedback da tentativa: lista de (código, ids do grupo), com os códigos em
+    # ordem crescente (o 🟩🟩🟩🟩🟩, se houver, é o último) e cada grupo em ordem crescente de id
+    ids = np.asarray(ids)
+    if not len(ids):
+        return []
+    codigos = linha_feedback(id_tentativa, ids)
+    ordem = np.argsort(codigos, kind="stable")
+    codigos_ordenados = codigos[ordem]
+    cortes = np.flatnonzero(np.diff(codigos_ordenados)) + 1
+    return list(zip(codigos_ordenados[np.r_[0, cortes]].tolist(), np.split(ids[ordem], cortes)))
+
+
+def construir_matriz(caminho=None):
+    # Calcula o feedback de todas as tentativas contra todos os segredos e salva em disco
+    caminho = caminho or caminho_matriz()
+    start = time.time()
+    n = len(letras)
+    matriz = np.empty((n, n), dtype=np.uint8)
+
+    for id_tentativa in range(n):
+        matriz[id_tentativa] = feedback_vetorizado(letras[id_tentativa], letras)
+
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    np.save(caminho, matriz)
+    print(f"Matriz de feedback {n}x{n} salva em {caminho} ({time.time() - start:.1f}s)")
+    return matriz
+
+
+def carregar_matriz():
+    # Abre a matriz com memmap (somente leitura): processos que abrem o mesmo arquivo
+    # compartilham as mesmas páginas do cache do sistema, sem copiar os ~112 MB
+    global _matriz
+    if _matriz is None:
+        caminho = caminho_matriz()
+        if not os.path.exists(caminho):
+            construir_matriz(caminho)
+        _matriz = np.load(caminho, mmap_mode="r")
+    return _matriz
+
+
+def uso_memoria():
+    # PID e RSS do processo atual em MB. No Linux separa a parte anônima (privada) da parte
+    # mapeada de arquivos, que é onde aparecem as páginas compartilhadas da matriz. Fora dele usa o
+    # psutil, se estiver instalado, ou o pico de RSS do módulo resource (em KB no Linux e em bytes
+    # no macOS); sem nenhuma dessas fontes (Windows sem psutil) o relatório só tem o PID.
+    memoria = {"pid": os.getpid()}
+    try:
+        with open("/proc/self/status") as status:
+            campos = dict(linha.split(":", 1) for linha in status if linha.startswith(("VmRSS", "RssAnon", "RssFile")))
+        memoria.update({nome: int(valor.split()[0]) / 1024 for nome, valor in campos.items()})
+        return memoria
+    except OSError:
+        pass
+    try:
+        import psutil
+        memoria["VmRSS"] = psutil.Process().memory_info().rss / 1024 ** 2
+        return memoria
+    except ImportError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return memoria
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    memoria["VmRSS"] = pico / 1024 ** 2 if sys.platform == "darwin" else pico / 1024
+    return memoria
+
+
+def descrever_memoria(memoria):
+    # Texto de um relatório de uso_memoria para as mensagens de progresso
+    if "VmRSS" not in memoria:
+        return f"RSS do processo {memoria['pid']}: indisponível"
+    texto = f"RSS do processo {memoria['pid']}: {memoria['VmRSS']:.1f} MB"
+    if "RssFile" in memoria:
+        texto += f" (arquivos compartilhados: {memoria['RssFile']:.1f} MB, privada: {memoria.get('RssAnon', 0):.1f} MB)"
+    return texto
+
+
+def feedback(id_tentativa, id_secreta):
+    # Consulta O(1) na matriz pré-calculada
+    return int(carregar_matriz()[id_tentativa, id_secreta])
+
+
+def verificar(palavra_secreta, tentativa):
+    # Usa a matriz quando as duas palavras estão na lista; senão calcula na hora
+    id_tentativa = mapa_ids().get(tentativa)
+    id_secreta = mapa_ids().get(palavra_secreta)
+    if id_tentativa is not None and id_secreta is not None:
+        return feedback(id_tentativa, id_secreta)
+    return calcular_codigo(palavra_secreta, tentativa)
+
+
+if __name__ == "__main__":
+    construir_matriz()
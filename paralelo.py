@@ -0,0 +1,26 @@
+from concurrent.futures import as_completed
+
+from padroes import carregar_matriz
+
+
+# Dados somente leitura de cada processo do pool (árvore de decisão, livro de abertura...), recebidos
+# uma vez pelo initializer em vez de irem junto com cada tarefa
+contexto = {}
+
+
+def inicializar_processo(dados=None):
+    # Initializer do ProcessPoolExecutor: abre a matriz de feedback (memmap) uma vez por processo e
+    # guarda `dados` em `contexto`. Os índices por tamanho já vêm prontos de lista_binaria, então as
+    # tarefas só levam ids de palavras.
+    carregar_matriz()
+    contexto.clear()
+    contexto.update(dados or {})
+
+
+def executar_em_blocos(executor, funcao, itens, tamanho_bloco, *args):
+    # Escalonamento dinâmico: os itens vão para a fila em blocos pequenos, que cada processo
+    # pega assim que fica livre; os resultados voltam na ordem em que ficam prontos
+    futuros = [executor.submit(funcao, itens[i:i + tamanho_bloco], *args)
+               for i in range(0, len(itens), tamanho_bloco)]
+    for futuro in as_completed(futuros):
+        yield futuro.result()
@@ -0,0 +1,68 @@
+import numpy as np
+
+from padroes import digitos_codigo, TAMANHO_PALAVRA, CINZA, VERDE
+from indice import alfabeto, indice_letra, bitsets_posicao, conjunto_completo, mascara_conjunto, limites_contagem, \
+    mascara_contagem, SEM_LETRA
+
+
+class EstadoRestricoes:
+    # Tudo o que os feedbacks de um jogo já disseram sobre a palavra secreta, acumulado turno a
+    # turno: letra fixa de cada posição (🟩), letras proibidas em cada posição (🟨 e ⬜) e o mínimo
+    # e máximo de cada letra. A cada feedback as restrições são compiladas num bitset das palavras
+    # que respeitam as posições (🟩 é um AND com o índice (posição, letra), 🟨 e ⬜ são um ANDNOT)
+    # e nos limites de contagem de cada letra, então filtrar é só consultar o bitset e a matriz de
+    # contagens, sem reler o histórico.
+    __slots__ = ("tentativas", "verdes", "posicoes", "minimo", "maximo", "impossivel")
+
+    def __init__(self):
+        self.tentativas = []
+        self.verdes = [None] * TAMANHO_PALAVRA
+        self.posicoes = conjunto_completo.copy()  # Bitset das palavras que respeitam as posições
+        self.minimo = np.zeros(len(alfabeto), dtype=np.uint8)
+        self.maximo = np.full(len(alfabeto), TAMANHO_PALAVRA, dtype=np.uint8)
+        self.impossivel = False  # Uma letra fora da lista recebeu 🟩 ou 🟨
+
+    def adicionar(self, tentativa, resultado):
+        # Acrescenta o feedback de uma tentativa (código inteiro) e recompila as restrições
+        tentativa = tentativa.lower()
+        digitos = digitos_codigo(resultado)
+        self.tentativas.append((tentativa, resultado))
+
+        for i, letra in enumerate(tentativa):
+            indice = indice_letra(letra)
+            if indice == SEM_LETRA:
+                # Nenhuma palavra da lista tem essa letra: 🟩 ou 🟨 não pode acontecer, ⬜ não restringe
+                self.impossivel |= digitos[i] != CINZA
+            elif digitos[i] == VERDE:
+                self.verdes[i] = letra
+                self.posicoes &= bitsets_posicao[i, indice]
+            else:
+                self.posicoes &= ~bitsets_posicao[i, indice]
+
+        minimo, maximo = limites_contagem(tentativa, resultado)
+        np.maximum(self.minimo, minimo, out=self.minimo)
+        np.minimum(self.maximo, maximo, out=self.maximo)
+
+    def mascara(self, ids):
+        # Máscara dos ids que ainda podem ser a palavra secreta
+        ids = np.asarray(ids)
+        if self.impossivel:
+            return np.zeros(len(ids), dtype=bool)
+        return mascara_conjunto(self.posicoes, ids) & mascara_contagem(ids, self.minimo, self.maximo)
+
+    def filtrar(self, ids):
+        ids = np.asarray(ids)
+        return ids[self.mascara(ids)]
+
+    def violacao_modo_dificil(self, tentativa):
+        # Modo difícil: toda letra 🟩 fica na mesma posição e toda letra revelada é usada.
+        # Retorna a mensagem do problema, ou None se a tentativa é permitida.
+        tentativa = tentativa.lower()
+        for i, letra in enumerate(self.verdes):
+            if letra is not None and tentativa[i] != letra:
+                return f"A {i + 1}ª letra deve ser {letra.upper()}."
+        for indice in np.flatnonzero(self.minimo):
+            letra = chr(alfabeto[indice])
+            if tentativa.count(letra) < self.minimo[indice]:
+                return f"A tentativa deve conter {letra.upper()}."
+        return None
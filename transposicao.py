@@ -0,0 +1,92 @@
+import functools
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from padroes import caminho_gerado
+
+
+TAMANHO_CHAVE = 16  # bytes do hash de cada conjunto de candidatos
+
+
+class CacheJogadas:
+    # Cache LRU de jogadas: o mesmo conjunto de candidatos aparece em muitos jogos, e a estratégia
+    # é determinística, então a jogada escolhida para ele pode ser reaproveitada. A chave é um hash
+    # dos ids (ordenados) mais o modo de chute; quando passa da capacidade, sai o menos usado.
+    __slots__ = ("capacidade", "_jogadas", "acertos", "falhas", "despejos")
+
+    def __init__(self, capacidade=100_000):
+        self.capacidade = capacidade
+        self._jogadas = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+        self.despejos = 0
+
+    def __len__(self):
+        return len(self._jogadas)
+
+    @staticmethod
+    def chave(ids_possiveis, ids_chute=None):
+        ids = np.sort(np.asarray(ids_possiveis, dtype=np.uint32))
+        modo = b"p" if ids_chute is None else b"c%d" % len(ids_chute)
+        return hashlib.blake2b(ids.tobytes() + modo, digest_size=TAMANHO_CHAVE).digest()
+
+    def obter(self, chave):
+        jogada = self._jogadas.get(chave)
+        if jogada is None:
+            self.falhas += 1
+            return None
+        self.acertos += 1
+        self._jogadas.move_to_end(chave)
+        return jogada
+
+    def guardar(self, chave, jogada):
+        self._jogadas[chave] = jogada
+        self._jogadas.move_to_end(chave)
+        while len(self._jogadas) > self.capacidade:
+            self._jogadas.popitem(last=False)
+            self.despejos += 1
+
+    def estatisticas(self):
+        consultas = self.acertos + self.falhas
+        return {"tamanho": len(self._jogadas), "acertos": self.acertos, "falhas": self.falhas,
+                "despejos": self.despejos, "taxa_acerto": self.acertos / consultas if consultas else 0.0}
+
+    def salvar(self, caminho):
+        # Guarda as entradas (da menos para a mais usada) num .npz
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        chaves = np.frombuffer(b"".join(self._jogadas.keys()), dtype=np.uint8).reshape(-1, TAMANHO_CHAVE)
+        jogadas = np.array(list(self._jogadas.values()), dtype=np.uint32)
+        np.savez(caminho, chaves=chaves, jogadas=jogadas)
+
+    def carregar(self, caminho):
+        # Acrescenta as entradas salvas, se o arquivo existir; retorna quantas foram lidas
+        if not os.path.exists(caminho):
+            return 0
+        with np.load(caminho) as dados:
+            chaves, jogadas = dados["chaves"], dados["jogadas"].tolist()
+        for chave, jogada in zip(chaves, jogadas):
+            self.guardar(chave.tobytes(), jogada)
+        return len(jogadas)
+
+
+def caminho_cache(estrategia, chute_completo):
+    return caminho_gerado("cache", estrategia, chute_completo)
+
+
+def memorizar(estrategia, cache):
+    # Envolve uma estratégia (ids_possiveis, ids_chute=None) -> id para consultar o cache antes de
+    # pontuar os candidatos. Um cache só deve ser usado com uma estratégia.
+    @functools.wraps(estrategia)
+    def estrategia_memorizada(ids_possiveis, ids_chute=None):
+        chave = cache.chave(ids_possiveis, ids_chute)
+        jogada = cache.obter(chave)
+        if jogada is None:
+            jogada = estrategia(ids_possiveis, ids_chute)
+            if jogada is not None:
+                cache.guardar(chave, jogada)
+        return jogada
+
+    return estrategia_memorizada